@@ -123,7 +123,8 @@ def nbd_disconnect(device):
 
 @nova.privsep.sys_admin_pctxt.entrypoint
 def create_device_maps(device):
-    return processutils.execute('kpartx', '-a', device)
+    # NOTE: -s makes kpartx wait until the partition mappings are created.
+    return processutils.execute('kpartx', '-a', '-s', device)
 
 
 @nova.privsep.sys_admin_pctxt.entrypoint
@@ -73,17 +73,38 @@ def server_group_db(sg):
 
 class ServerGroupQuotasTestV21(test.TestCase):
 
+    _POLICIES = ('anti-affinity',)
+
+    @classmethod
+    def setUpClass(cls):
+        super(ServerGroupQuotasTestV21, cls).setUpClass()
+        # NOTE: Neither the controller nor the blank request carry any state
+        # between tests, so build them once per class rather than per test.
+        # Use _fresh_req() to get a request that can be modified.
+        cls._controller = sg_v21.ServerGroupController()
+        cls._blank_req = fakes.HTTPRequest.blank('')
+        # The controller does not modify the request body, so all tests can
+        # share a single one.
+        cls._body = {'server_group': server_group_template(
+            policies=list(cls._POLICIES))}
+
     def setUp(self):
         super(ServerGroupQuotasTestV21, self).setUp()
         self._setup_controller()
-        self.req = fakes.HTTPRequest.blank('')
+        self.req = self._blank_req
 
     def _setup_controller(self):
-        self.controller = sg_v21.ServerGroupController()
+        self.controller = self._controller
 
     def _setup_quotas(self):
         pass
 
+    def _fresh_req(self):
+        environ = dict(self._blank_req.environ)
+        # webob keeps attributes such as api_version_request in the environ
+        environ['webob.adhoc_attrs'] = dict(environ['webob.adhoc_attrs'])
+        return fakes.HTTPRequest(environ)
+
     def _assert_server_groups_in_use(self, project_id, user_id, in_use):
         ctxt = context.get_admin_context()
         counts = objects.InstanceGroupList.get_counts(ctxt, project_id,
@@ -93,47 +114,68 @@ class ServerGroupQuotasTestV21(test.TestCase):
 
     def test_create_server_group_normal(self):
         self._setup_quotas()
-        sgroup = server_group_template()
-        policies = ['anti-affinity']
-        sgroup['policies'] = policies
-        res_dict = self.controller.create(self.req,
-                                          body={'server_group': sgroup})
+        res_dict = self.controller.create(self.req, body=self._body)
         self.assertEqual(res_dict['server_group']['name'], 'test')
         self.assertTrue(uuidutils.is_uuid_like(res_dict['server_group']['id']))
-        self.assertEqual(res_dict['server_group']['policies'], policies)
+        self.assertEqual(res_dict['server_group']['policies'],
+                         list(self._POLICIES))
 
     def test_create_server_group_quota_limit(self):
         self._setup_quotas()
-        sgroup = server_group_template()
-        policies = ['anti-affinity']
-        sgroup['policies'] = policies
         # Start by creating as many server groups as we're allowed to.
         for i in range(CONF.quota.server_groups):
-            self.controller.create(self.req, body={'server_group': sgroup})
+            self.controller.create(self.req, body=self._body)
+
+        # Then, creating a server group should fail.
+        self.assertRaises(webob.exc.HTTPForbidden,
+                          self.controller.create,
+                          self.req, body=self._body)
+
+    @mock.patch('nova.objects.InstanceGroupList.get_counts')
+    @mock.patch('nova.objects.InstanceGroup.create', autospec=True)
+    def test_create_server_group_quota_limit_counted(self, mock_create,
+                                                     mock_get_counts):
+        # Same as test_create_server_group_quota_limit, but the server group
+        # count is kept in memory so the quota does not need to be exhausted
+        # through the database first.
+        self._setup_quotas()
+        self._count = CONF.quota.server_groups - 1
+
+        def fake_create(group):
+            group.uuid = uuidutils.generate_uuid()
+            group.policies = [group.policy]
+            group.members = []
+            self._count += 1
+
+        def fake_get_counts(context, project_id, user_id=None):
+            return {'project': {'server_groups': self._count},
+                    'user': {'server_groups': self._count}}
+
+        mock_create.side_effect = fake_create
+        mock_get_counts.side_effect = fake_get_counts
+
+        # The last server group allowed by the quota can be created.
+        self.controller.create(self.req, body=self._body)
+        self.assertEqual(CONF.quota.server_groups, self._count)
 
         # Then, creating a server group should fail.
         self.assertRaises(webob.exc.HTTPForbidden,
                           self.controller.create,
-                          self.req, body={'server_group': sgroup})
+                          self.req, body=self._body)
+        self.assertEqual(1, mock_create.call_count)
 
     @mock.patch('nova.objects.Quotas.check_deltas')
     def test_create_server_group_recheck_disabled(self, mock_check):
         self.flags(recheck_quota=False, group='quota')
         self._setup_quotas()
-        sgroup = server_group_template()
-        policies = ['anti-affinity']
-        sgroup['policies'] = policies
-        self.controller.create(self.req, body={'server_group': sgroup})
+        self.controller.create(self.req, body=self._body)
         ctxt = self.req.environ['nova.context']
         mock_check.assert_called_once_with(ctxt, {'server_groups': 1},
                                            ctxt.project_id, ctxt.user_id)
 
     def test_delete_server_group_by_admin(self):
         self._setup_quotas()
-        sgroup = server_group_template()
-        policies = ['anti-affinity']
-        sgroup['policies'] = policies
-        res = self.controller.create(self.req, body={'server_group': sgroup})
+        res = self.controller.create(self.req, body=self._body)
         sg_id = res['server_group']['id']
         context = self.req.environ['nova.context']
 
@@ -141,7 +183,8 @@ class ServerGroupQuotasTestV21(test.TestCase):
                                           context.user_id, 1)
 
         # Delete the server group we've just created.
-        req = fakes.HTTPRequest.blank('', use_admin_context=True)
+        req = self._fresh_req()
+        req.environ['nova.context'] = context.elevated()
         self.controller.delete(req, sg_id)
 
         # Make sure the quota in use has been released.
@@ -135,7 +135,8 @@ class PrivsepFilesystemHelpersTestCase(test.NoDBTestCase):
     @mock.patch('oslo_concurrency.processutils.execute')
     def test_create_device_maps(self, mock_execute):
         nova.privsep.fs.create_device_maps('/dev/nosuch')
-        mock_execute.assert_called_with('kpartx', '-a', '/dev/nosuch')
+        mock_execute.assert_called_with('kpartx', '-a', '-s',
+                                        '/dev/nosuch')
 
     @mock.patch('oslo_concurrency.processutils.execute')
     def test_remove_device_maps(self, mock_execute):
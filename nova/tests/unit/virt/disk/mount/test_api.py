@@ -55,11 +55,23 @@ class MountTestCase(test.NoDBTestCase):
                 self.fail("Unexpected call with: %s" % filename)
         return exists_effect
 
-    def _check_calls(self, exists, filenames, trailing=0):
+    def _check_calls(self, exists, filenames):
         self.assertEqual([mock.call(x) for x in filenames],
-                exists.call_args_list[:len(filenames)])
-        self.assertEqual([mock.call(MAP_PARTITION)] * trailing,
-            exists.call_args_list[len(filenames):])
+                exists.call_args_list)
+
+    def test_state_flag_clear_keeps_other_flags(self):
+        mount = api.Mount(mock.sentinel.image, mock.sentinel.mount_dir)
+        mount.linked = mount.mapped = mount.mounted = True
+        mount.automapped = True
+
+        mount.mapped = False
+
+        self.assertFalse(mount.mapped)
+        self.assertTrue(mount.linked)
+        self.assertTrue(mount.mounted)
+        self.assertTrue(mount.automapped)
+        self.assertEqual(api.LINKED | api.MOUNTED | api.AUTOMAPPED,
+                         mount._state)
 
     @mock.patch('os.path.exists')
     def test_map_dev_partition_search(self, exists):
@@ -70,54 +82,82 @@ class MountTestCase(test.NoDBTestCase):
         self.assertNotEqual("", mount.error)
         self.assertFalse(mount.mapped)
 
+    @mock.patch('os.stat')
     @mock.patch('os.path.exists')
     @mock.patch('nova.privsep.fs.create_device_maps',
                 return_value=(None, None))
-    def test_map_dev_good(self, mock_create_maps, mock_exists):
+    def test_map_dev_good(self, mock_create_maps, mock_exists, mock_stat):
         mock_exists.side_effect = self._exists_effect({
             ORIG_DEVICE: True,
-            AUTOMAP_PARTITION: False,
-            MAP_PARTITION: [False, True]})
+            AUTOMAP_PARTITION: False})
         mount = self._test_map_dev(PARTITION)
-        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION], 2)
+        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION])
+        mock_stat.assert_called_once_with(MAP_PARTITION)
+        self.assertEqual(MAP_PARTITION, mount.mapped_device)
         self.assertEqual("", mount.error)
         self.assertTrue(mount.mapped)
 
+    @mock.patch('os.stat', side_effect=FileNotFoundError)
     @mock.patch('os.path.exists')
     @mock.patch('nova.privsep.fs.create_device_maps',
                 return_value=(None, None))
-    def test_map_dev_error(self, mock_create_maps, mock_exists):
+    def test_map_dev_error(self, mock_create_maps, mock_exists, mock_stat):
         mock_exists.side_effect = self._exists_effect({
             ORIG_DEVICE: True,
-            AUTOMAP_PARTITION: False,
-            MAP_PARTITION: False})
+            AUTOMAP_PARTITION: False})
         mount = self._test_map_dev(PARTITION)
-        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION],
-                api.MAX_FILE_CHECKS + 1)
+        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION])
+        # NOTE: Logging the final failure stats source files as well, so
+        # only count the checks of the mapped partition.
+        self.assertEqual(api.MAX_FILE_CHECKS,
+                         mock_stat.call_args_list.count(
+                             mock.call(MAP_PARTITION)))
         self.assertNotEqual("", mount.error)
         self.assertFalse(mount.mapped)
 
+    @mock.patch('os.stat',
+                side_effect=[FileNotFoundError, FileNotFoundError, None])
     @mock.patch('os.path.exists')
     @mock.patch('nova.privsep.fs.create_device_maps',
                 return_value=(None, None))
-    def test_map_dev_error_then_pass(self, mock_create_maps, mock_exists):
+    def test_map_dev_error_then_pass(self, mock_create_maps, mock_exists,
+                                     mock_stat):
         mock_exists.side_effect = self._exists_effect({
             ORIG_DEVICE: True,
-            AUTOMAP_PARTITION: False,
-            MAP_PARTITION: [False, False, True]})
+            AUTOMAP_PARTITION: False})
         mount = self._test_map_dev(PARTITION)
-        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION], 3)
+        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION])
+        self.assertEqual([mock.call(MAP_PARTITION)] * 3,
+                         mock_stat.call_args_list)
         self.assertEqual("", mount.error)
         self.assertTrue(mount.mapped)
 
+    @mock.patch('os.stat', side_effect=PermissionError)
+    @mock.patch('os.path.exists')
+    @mock.patch('nova.privsep.fs.create_device_maps',
+                return_value=(None, None))
+    def test_map_dev_stat_error(self, mock_create_maps, mock_exists,
+                                mock_stat):
+        mock_exists.side_effect = self._exists_effect({
+            ORIG_DEVICE: True,
+            AUTOMAP_PARTITION: False})
+        mount = self._test_map_dev(PARTITION)
+        self._check_calls(mock_exists, [ORIG_DEVICE, AUTOMAP_PARTITION])
+        # NOTE: Logging the final failure stats source files as well, so
+        # only count the checks of the mapped partition.
+        self.assertEqual(api.MAX_FILE_CHECKS,
+                         mock_stat.call_args_list.count(
+                             mock.call(MAP_PARTITION)))
+        self.assertNotEqual("", mount.error)
+        self.assertFalse(mount.mapped)
+
     @mock.patch('os.path.exists')
     def test_map_dev_automap(self, exists):
         exists.side_effect = self._exists_effect({
             ORIG_DEVICE: True,
             AUTOMAP_PARTITION: True})
         mount = self._test_map_dev(PARTITION)
-        self._check_calls(exists,
-            [ORIG_DEVICE, AUTOMAP_PARTITION, AUTOMAP_PARTITION])
+        self._check_calls(exists, [ORIG_DEVICE, AUTOMAP_PARTITION])
         self.assertEqual(AUTOMAP_PARTITION, mount.mapped_device)
         self.assertTrue(mount.automapped)
         self.assertTrue(mount.mapped)
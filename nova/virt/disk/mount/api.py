@@ -31,6 +31,36 @@ MAX_DEVICE_WAIT = 30
 MAX_FILE_CHECKS = 6
 FILE_CHECK_INTERVAL = 0.25
 
+# Bits of Mount._state
+LINKED = 1
+MAPPED = 2
+MOUNTED = 4
+AUTOMAPPED = 8
+
+
+def _mount_class(module_name, class_name):
+    """Resolve a Mount subclass.
+
+    The subclasses import this module, so they can't be imported at module
+    scope here. The class is looked up on each call so that it can still be
+    replaced by mock.patch.
+    """
+    return getattr(importutils.import_module(module_name), class_name)
+
+
+def _state_flag(flag):
+    """Expose a single bit of Mount._state as a boolean attribute."""
+    def getter(self):
+        return bool(self._state & flag)
+
+    def setter(self, value):
+        if value:
+            self._state |= flag
+        else:
+            self._state &= ~flag
+
+    return property(getter, setter)
+
 
 class Mount(object):
     """Standard mounting operations, that can be overridden by subclasses.
@@ -41,6 +71,13 @@ class Mount(object):
 
     mode = None  # to be overridden in subclasses
 
+    # Compatibility accessors for external callers; Mount and its subclasses
+    # update _state directly.
+    linked = _state_flag(LINKED)
+    mapped = _state_flag(MAPPED)
+    mounted = _state_flag(MOUNTED)
+    automapped = _state_flag(AUTOMAPPED)
+
     @staticmethod
     def instance_for_format(image, mountdir, partition):
         """Get a Mount instance for the image type
@@ -57,19 +94,16 @@ class Mount(object):
         if isinstance(image, imgmodel.LocalFileImage):
             if image.format == imgmodel.FORMAT_RAW:
                 LOG.debug("Using LoopMount")
-                return importutils.import_object(
-                    "nova.virt.disk.mount.loop.LoopMount",
-                    image, mountdir, partition)
+                return _mount_class('nova.virt.disk.mount.loop',
+                                    'LoopMount')(image, mountdir, partition)
             else:
                 LOG.debug("Using NbdMount")
-                return importutils.import_object(
-                    "nova.virt.disk.mount.nbd.NbdMount",
-                    image, mountdir, partition)
+                return _mount_class('nova.virt.disk.mount.nbd',
+                                    'NbdMount')(image, mountdir, partition)
         elif isinstance(image, imgmodel.LocalBlockImage):
             LOG.debug("Using BlockMount")
-            return importutils.import_object(
-                    "nova.virt.disk.mount.block.BlockMount",
-                    image, mountdir, partition)
+            return _mount_class('nova.virt.disk.mount.block', 'BlockMount')(
+                image, mountdir, partition)
         else:
             # TODO(berrange) We could mount RBDImage directly
             # using kernel RBD block dev support.
@@ -99,18 +133,15 @@ class Mount(object):
 
         if "loop" in device:
             LOG.debug("Using LoopMount")
-            return importutils.import_object(
-                "nova.virt.disk.mount.loop.LoopMount",
+            return _mount_class('nova.virt.disk.mount.loop', 'LoopMount')(
                 image, mountdir, partition, device)
         elif "nbd" in device:
             LOG.debug("Using NbdMount")
-            return importutils.import_object(
-                "nova.virt.disk.mount.nbd.NbdMount",
+            return _mount_class('nova.virt.disk.mount.nbd', 'NbdMount')(
                 image, mountdir, partition, device)
         else:
             LOG.debug("Using BlockMount")
-            return importutils.import_object(
-                "nova.virt.disk.mount.block.BlockMount",
+            return _mount_class('nova.virt.disk.mount.block', 'BlockMount')(
                 image, mountdir, partition, device)
 
     def __init__(self, image, mount_dir, partition=None, device=None):
@@ -131,7 +162,7 @@ class Mount(object):
         self.error = ""
 
         # Internal
-        self.linked = self.mapped = self.mounted = self.automapped = False
+        self._state = 0
         self.device = self.mapped_device = device
 
         # Reset to mounted dir if possible
@@ -142,7 +173,7 @@ class Mount(object):
         if not self.device:
             return
 
-        self.linked = self.mapped = self.mounted = True
+        self._state |= LINKED | MAPPED | MOUNTED
 
         device = self.device
         if os.path.isabs(device) and os.path.exists(device):
@@ -155,7 +186,7 @@ class Mount(object):
     def get_dev(self):
         """Make the image available as a block device in the file system."""
         self.device = None
-        self.linked = True
+        self._state |= LINKED
         return True
 
     def _get_dev_retry_helper(self):
@@ -180,21 +211,32 @@ class Mount(object):
 
     def unget_dev(self):
         """Release the block device from the file system namespace."""
-        self.linked = False
+        self._state &= ~LINKED
 
     def map_dev(self):
         """Map partitions of the device to the file system namespace."""
         assert(os.path.exists(self.device))
         LOG.debug("Map dev %s", self.device)
-        automapped_path = '/dev/%sp%s' % (os.path.basename(self.device),
-                                              self.partition)
-
-        if self.partition == -1:
+        partition = self.partition
+        if partition == -1:
             self.error = _('partition search unsupported with %s') % self.mode
-        elif self.partition and not os.path.exists(automapped_path):
-            map_path = '/dev/mapper/%sp%s' % (os.path.basename(self.device),
-                                              self.partition)
-            assert(not os.path.exists(map_path))
+            return bool(self._state & MAPPED)
+        if not partition:
+            self.mapped_device = self.device
+            self._state |= MAPPED
+            return True
+
+        device_name = os.path.basename(self.device)
+        automapped_path = '/dev/%sp%s' % (device_name, partition)
+        if os.path.exists(automapped_path):
+            # Note auto mapping can be enabled with the 'max_part' option
+            # to the nbd or loop kernel modules. Beware of possible races
+            # in the partition scanning for _loop_ devices though
+            # (details in bug 1024586), which are currently uncatered for.
+            self.mapped_device = automapped_path
+            self._state |= MAPPED | AUTOMAPPED
+        else:
+            map_path = '/dev/mapper/%sp%s' % (device_name, partition)
 
             # Note kpartx can output warnings to stderr and succeed
             # Also it can output failures to stderr and "succeed"
@@ -204,44 +246,32 @@ class Mount(object):
             @loopingcall.RetryDecorator(
                     max_retry_count=MAX_FILE_CHECKS - 1,
                     max_sleep_time=FILE_CHECK_INTERVAL,
-                    exceptions=IOError)
+                    exceptions=OSError)
             def recheck_path(map_path):
-                if not os.path.exists(map_path):
-                    raise IOError()
+                os.stat(map_path)
 
             # Note kpartx does nothing when presented with a raw image,
             # so given we only use it when we expect a partitioned image, fail
             try:
                 recheck_path(map_path)
-                self.mapped_device = map_path
-                self.mapped = True
-            except IOError:
+            except OSError:
                 if not err:
-                    err = _('partition %s not found') % self.partition
+                    err = _('partition %s not found') % partition
                 self.error = _('Failed to map partitions: %s') % err
-        elif self.partition and os.path.exists(automapped_path):
-            # Note auto mapping can be enabled with the 'max_part' option
-            # to the nbd or loop kernel modules. Beware of possible races
-            # in the partition scanning for _loop_ devices though
-            # (details in bug 1024586), which are currently uncatered for.
-            self.mapped_device = automapped_path
-            self.mapped = True
-            self.automapped = True
-        else:
-            self.mapped_device = self.device
-            self.mapped = True
+            else:
+                self.mapped_device = map_path
+                self._state |= MAPPED
 
-        return self.mapped
+        return bool(self._state & MAPPED)
 
     def unmap_dev(self):
         """Remove partitions of the device from the file system namespace."""
-        if not self.mapped:
+        if not self._state & MAPPED:
             return
         LOG.debug("Unmap dev %s", self.device)
-        if self.partition and not self.automapped:
+        if self.partition and not self._state & AUTOMAPPED:
             nova.privsep.fs.remove_device_maps(self.device)
-        self.mapped = False
-        self.automapped = False
+        self._state &= ~(MAPPED | AUTOMAPPED)
 
     def mnt_dev(self):
         """Mount the device into the file system."""
@@ -254,17 +284,17 @@ class Mount(object):
             LOG.debug(self.error)
             return False
 
-        self.mounted = True
+        self._state |= MOUNTED
         return True
 
     def unmnt_dev(self):
         """Unmount the device from the file system."""
-        if not self.mounted:
+        if not self._state & MOUNTED:
             return
         self.flush_dev()
         LOG.debug("Umount %s", self.mapped_device)
         nova.privsep.fs.umount(self.mapped_device)
-        self.mounted = False
+        self._state &= ~MOUNTED
 
     def flush_dev(self):
         pass
@@ -282,14 +312,14 @@ class Mount(object):
 
     def do_umount(self):
         """Call the unmnt operation."""
-        if self.mounted:
+        if self._state & MOUNTED:
             self.unmnt_dev()
 
     def do_teardown(self):
         """Call the umnt, unmap, and unget operations."""
-        if self.mounted:
+        if self._state & MOUNTED:
             self.unmnt_dev()
-        if self.mapped:
+        if self._state & MAPPED:
             self.unmap_dev()
-        if self.linked:
+        if self._state & LINKED:
             self.unget_dev()
@@ -25,9 +25,9 @@ class BlockMount(api.Mount):
 
     def get_dev(self):
         self.device = self.image.path
-        self.linked = True
+        self._state |= api.LINKED
         return True
 
     def unget_dev(self):
-        self.linked = False
+        self._state &= ~api.LINKED
         self.device = None
@@ -31,13 +31,13 @@ class LoopMount(api.Mount):
         if err:
             self.error = _('Could not attach image to loopback: %s') % err
             LOG.info('Loop mount error: %s', self.error)
-            self.linked = False
+            self._state &= ~api.LINKED
             self.device = None
             return False
 
         self.device = out.strip()
         LOG.debug("Got loop device %s", self.device)
-        self.linked = True
+        self._state |= api.LINKED
         return True
 
     def get_dev(self):
@@ -48,7 +48,7 @@ class LoopMount(api.Mount):
         return self._get_dev_retry_helper()
 
     def unget_dev(self):
-        if not self.linked:
+        if not self._state & api.LINKED:
             return
 
         # NOTE(mikal): On some kernels, losetup -d will intermittently fail,
@@ -56,5 +56,5 @@ class LoopMount(api.Mount):
         # https://lkml.org/lkml/2012/9/28/62
         LOG.debug("Release loop device %s", self.device)
         nova.privsep.fs.loopremove(self.device)
-        self.linked = False
+        self._state &= ~api.LINKED
         self.device = None
@@ -114,7 +114,7 @@ class NbdMount(api.Mount):
             return False
 
         self.error = ''
-        self.linked = True
+        self._state |= api.LINKED
         return True
 
     def get_dev(self):
@@ -122,11 +122,11 @@ class NbdMount(api.Mount):
         return self._get_dev_retry_helper()
 
     def unget_dev(self):
-        if not self.linked:
+        if not self._state & api.LINKED:
             return
         LOG.debug('Release nbd device %s', self.device)
         nova.privsep.fs.nbd_disconnect(self.device)
-        self.linked = False
+        self._state &= ~api.LINKED
         self.device = None
 
     def flush_dev(self):